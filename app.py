@@ -1,13 +1,32 @@
 import contextlib
-import io
-import json
+import gzip
+import hashlib
+import logging
+import multiprocessing
 import os
+import shutil
+import tempfile
+import threading
+import time
 import uuid
-from typing import Any, Dict
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
 
+import orjson
 from flask import Flask, Response, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from werkzeug.utils import secure_filename
 
+try:
+    import redis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+import mortgage_core
 from mortgage_core import (
     MORTGAGE_DOC_TYPES,
     classify_document,
@@ -16,29 +35,330 @@ from mortgage_core import (
     run_agentic_pipeline,
     run_full_pipeline,
 )
+from mortgage_core import logger as pipeline_logger
 
 UPLOAD_FOLDER = "uploads"
 SCHEMA_DIR = "schemas"
 MODELS_FILE = "models.json"
+UPLOAD_CHUNK_SIZE = 1 << 20
+PIPELINE_WORKERS = int(os.environ.get("PIPELINE_WORKERS", "2"))
+REDIS_URL = os.environ.get("REDIS_URL")
+DOC_TTL_SECONDS = int(os.environ.get("DOC_TTL_SECONDS", "3600"))
+JOB_TTL_SECONDS = int(os.environ.get("JOB_TTL_SECONDS", "3600"))
+SWEEP_INTERVAL_SECONDS = int(os.environ.get("SWEEP_INTERVAL_SECONDS", "60"))
+LOG_CAPTURE_MAXLEN = 10_000
+RESPONSE_CACHE_TTL_SECONDS = int(os.environ.get("RESPONSE_CACHE_TTL_SECONDS", "300"))
 
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(SCHEMA_DIR, exist_ok=True)
 
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson; responses are encoded straight to bytes.
+    """
+
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=self.option).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self.option)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 
-DOC_STORE: Dict[str, str] = {}
+
+class SharedStore:
+    """
+    Small JSON key/value store with per-key TTL.
+    Uses Redis when REDIS_URL is set (shared by all workers), otherwise an
+    in-process dict (single worker only) whose expired entries are purged
+    at most once per SWEEP_INTERVAL_SECONDS, on write.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self._redis = None
+        if redis_url:
+            if not REDIS_AVAILABLE:
+                raise RuntimeError("REDIS_URL is set but the 'redis' package is not installed.")
+            self._redis = redis.Redis.from_url(redis_url)
+        self._local: Dict[str, Tuple[float, Any]] = {}
+        self._local_lock = threading.Lock()
+        self._next_purge = 0.0
+
+    @property
+    def shared(self) -> bool:
+        """True when every worker sees the same keys (Redis-backed)."""
+        return self._redis is not None
+
+    def get(self, key: str) -> Any:
+        if self._redis is not None:
+            raw = self._redis.get(key)
+            return None if raw is None else orjson.loads(raw)
+        with self._local_lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at and expires_at < time.monotonic():
+                del self._local[key]
+                return None
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        if self._redis is not None:
+            self._redis.set(key, orjson.dumps(value), ex=ttl)
+            return
+        now = time.monotonic()
+        with self._local_lock:
+            self._local[key] = (now + ttl if ttl else 0.0, value)
+            if now >= self._next_purge:
+                self._next_purge = now + SWEEP_INTERVAL_SECONDS
+                self._local = {
+                    k: entry
+                    for k, entry in self._local.items()
+                    if not entry[0] or entry[0] >= now
+                }
+
+    def delete(self, *keys: str) -> None:
+        if self._redis is not None:
+            if keys:
+                self._redis.delete(*keys)
+            return
+        with self._local_lock:
+            for key in keys:
+                self._local.pop(key, None)
+
+
+# doc:<doc_id> -> upload path
+# upload:<digest> -> {"doc_id": ..., "classification": ...} for re-uploads
+# resp:doc-types -> cached /api/doc-types payload (Redis only, see api_doc_types)
+# job:<job_id> -> {"status": "running" | "done" | "error", ...} (see submit_job)
+# result:<doc_id>:<pipeline>:<schema+options digest> -> pipeline result (see run_cached)
+STORE = SharedStore(REDIS_URL)
+
+
+_next_upload_sweep = 0.0
+
+
+def sweep_uploads() -> None:
+    """
+    Delete files in UPLOAD_FOLDER whose doc:<doc_id> key has expired.
+    Runs at most once per SWEEP_INTERVAL_SECONDS. Files modified within the
+    last DOC_TTL_SECONDS are always kept, so in-flight uploads are safe.
+    """
+    global _next_upload_sweep
+    now = time.monotonic()
+    if now < _next_upload_sweep:
+        return
+    _next_upload_sweep = now + SWEEP_INTERVAL_SECONDS
+
+    cutoff = time.time() - DOC_TTL_SECONDS
+    with os.scandir(UPLOAD_FOLDER) as entries:
+        for entry in entries:
+            try:
+                if not entry.is_file() or entry.stat().st_mtime > cutoff:
+                    continue
+            except FileNotFoundError:
+                continue
+            doc_id = entry.name.split("_", 1)[0]
+            if STORE.get(f"doc:{doc_id}") is None:
+                with contextlib.suppress(OSError):
+                    os.remove(entry.path)
+
+
+def _touch(path: str) -> bool:
+    """
+    Bump path's mtime so sweep_uploads() keeps it; False if it is already gone.
+    """
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def cached_payload(key: str, build: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Return STORE[key], building and caching it for RESPONSE_CACHE_TTL_SECONDS on a miss.
+    """
+    payload = STORE.get(key)
+    if payload is None:
+        payload = build()
+        STORE.set(key, payload, ttl=RESPONSE_CACHE_TTL_SECONDS)
+    return payload
+
+
+def pipeline_result_key(
+    doc_id: str, pipeline: str, doc_type_id: Optional[str], **options: Any
+) -> Optional[str]:
+    """
+    STORE key for a pipeline result on doc_id, or None if it can't be cached.
+    The key covers the resolved schema, so editing the template starts afresh.
+    Re-uploads of identical bytes get the same doc_id, so they hit it too.
+    Without doc_type_id the pipeline classifies the document itself and the
+    schema isn't known up front, so those runs aren't cached.
+    """
+    if not doc_type_id:
+        return None
+    key_material = {
+        "doc_type_id": doc_type_id,
+        "schema": load_schema_for_doc_type(doc_type_id),
+        "options": options,
+    }
+    digest = hashlib.blake2b(
+        orjson.dumps(key_material, option=orjson.OPT_SORT_KEYS), digest_size=8
+    ).hexdigest()
+    return f"result:{doc_id}:{pipeline}:{digest}"
+
+
+def is_cacheable_result(result: Dict[str, Any]) -> bool:
+    """
+    False when the extraction came back empty. The extractor turns API errors
+    (rate limits, timeouts, bad JSON) into all-empty results, and those must
+    not be replayed to later retries.
+    """
+    extracted = result.get("extracted_data", result.get("extracted_final")) or {}
+    return any(value not in ("", None, [], {}) for value in extracted.values())
+
+
+def run_cached(
+    cache_key: Optional[str], force: bool, fn: Callable[..., Dict[str, Any]], **kwargs: Any
+) -> Dict[str, Any]:
+    """
+    Return the result cached at cache_key, or run fn(**kwargs) and cache it
+    for DOC_TTL_SECONDS. force skips the lookup but still refreshes the cache.
+    """
+    if cache_key and not force:
+        cached = STORE.get(cache_key)
+        if cached is not None:
+            return cached
+    result = fn(**kwargs)
+    if cache_key and is_cacheable_result(result):
+        STORE.set(cache_key, result, ttl=DOC_TTL_SECONDS)
+    return result
+
+
+_pipeline_pool: ProcessPoolExecutor | None = None
+_pipeline_pool_lock = threading.Lock()
+
+
+def _init_pipeline_worker() -> None:
+    # Uploads are rasterized for classification in the web process, not here,
+    # so a per-worker page cache would mostly just hold memory.
+    mortgage_core.PAGE_CACHE_MAX_BYTES = 0
+
+
+def get_pipeline_pool(broken: ProcessPoolExecutor | None = None) -> ProcessPoolExecutor:
+    """
+    Lazily create the pipeline pool, replacing `broken` if it is still current.
+    Workers are spawned, not forked, so they don't inherit the OpenAI client's
+    sockets or locks held by other threads.
+    """
+    global _pipeline_pool
+    with _pipeline_pool_lock:
+        if broken is not None and _pipeline_pool is broken:
+            _pipeline_pool.shutdown(wait=False, cancel_futures=True)
+            _pipeline_pool = None
+        if _pipeline_pool is None:
+            _pipeline_pool = ProcessPoolExecutor(
+                max_workers=PIPELINE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_pipeline_worker,
+            )
+        return _pipeline_pool
+
+
+def _record_job(job_id: str, future: Future, cache_key: Optional[str]) -> None:
+    try:
+        result = future.result()
+        STORE.set(f"job:{job_id}", {"status": "done", "result": result}, ttl=JOB_TTL_SECONDS)
+        if cache_key and is_cacheable_result(result):
+            STORE.set(cache_key, result, ttl=DOC_TTL_SECONDS)
+    except Exception as exc:  # noqa: BLE001
+        STORE.set(f"job:{job_id}", {"status": "error", "error": str(exc)}, ttl=JOB_TTL_SECONDS)
+
+
+def submit_job(
+    fn: Callable[..., Dict[str, Any]],
+    cache_key: Optional[str] = None,
+    force: bool = False,
+    **kwargs: Any,
+) -> str:
+    """
+    Run fn(**kwargs) in the pipeline process pool; poll via /api/jobs/<job_id>.
+    The job's state and result live in STORE for JOB_TTL_SECONDS. With
+    cache_key, a result already cached there is reported as done without
+    running fn (unless force), and a usable fresh result is cached there
+    for DOC_TTL_SECONDS (see run_cached).
+    """
+    job_id = str(uuid.uuid4())
+    cached = STORE.get(cache_key) if cache_key and not force else None
+    if cached is not None:
+        STORE.set(f"job:{job_id}", {"status": "done", "result": cached}, ttl=JOB_TTL_SECONDS)
+        return job_id
+    STORE.set(f"job:{job_id}", {"status": "running"}, ttl=JOB_TTL_SECONDS)
+    try:
+        pool = get_pipeline_pool()
+        try:
+            future = pool.submit(fn, **kwargs)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); start a fresh pool.
+            future = get_pipeline_pool(broken=pool).submit(fn, **kwargs)
+    except BaseException:
+        STORE.delete(f"job:{job_id}")
+        raise
+    future.add_done_callback(lambda f: _record_job(job_id, f, cache_key))
+    return job_id
+
+
+# Parsed models.json, keyed on the file's (mtime_ns, size) stamp.
+_models_cache: Dict[str, Any] = {"stamp": None, "data": {}}
+
+
+def _file_stamp(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
 
 
 def load_models() -> Dict[str, Any]:
-    if not os.path.exists(MODELS_FILE):
+    try:
+        stamp = _file_stamp(MODELS_FILE)
+    except FileNotFoundError:
         return {}
-    with open(MODELS_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    if _models_cache["stamp"] != stamp:
+        with open(MODELS_FILE, "rb") as f:
+            _models_cache["data"] = orjson.loads(f.read())
+        _models_cache["stamp"] = stamp
+    return dict(_models_cache["data"])
 
 
 def save_models(models: Dict[str, Any]) -> None:
-    with open(MODELS_FILE, "w", encoding="utf-8") as f:
-        json.dump(models, f, indent=2)
+    with open(MODELS_FILE, "wb") as f:
+        f.write(orjson.dumps(models, option=orjson.OPT_INDENT_2))
+    _models_cache["data"] = dict(models)
+    _models_cache["stamp"] = _file_stamp(MODELS_FILE)
+
+
+def load_schema_file(path: str) -> Dict[str, Any] | None:
+    """
+    Return the parsed schema stored at path, or None if missing/unreadable.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except (OSError, ValueError):
+        return None
 
 
 def discover_schema_doc_types() -> Dict[str, str]:
@@ -56,16 +376,70 @@ def discover_schema_doc_types() -> Dict[str, str]:
     return doc_types
 
 
+class LogCaptureHandler(logging.Handler):
+    """
+    Collects log lines emitted on the creating thread into a bounded deque,
+    so concurrent requests don't see each other's pipeline logs.
+    """
+
+    def __init__(self, maxlen: int = LOG_CAPTURE_MAXLEN):
+        super().__init__(level=logging.INFO)
+        self.lines: Deque[str] = deque(maxlen=maxlen)
+        self._thread_id = threading.get_ident()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.thread != self._thread_id:
+            return
+        self.lines.extend(self.format(record).splitlines())
+
+
 def run_pipeline_with_logs(path: str, override_doc_type_id: str | None = None) -> Dict[str, Any]:
-    log_buffer = io.StringIO()
-    with contextlib.redirect_stdout(log_buffer):
+    handler = LogCaptureHandler()
+    pipeline_logger.addHandler(handler)
+    try:
         result = run_full_pipeline(path, override_doc_type_id=override_doc_type_id)
-    logs_text = log_buffer.getvalue()
-    logs = logs_text.splitlines()
-    result["logs"] = logs
+    finally:
+        pipeline_logger.removeHandler(handler)
+    result["logs"] = list(handler.lines)
     return result
 
 
+def save_upload(file, save_path: str) -> str:
+    """
+    Stream an uploaded file to disk in UPLOAD_CHUNK_SIZE chunks.
+    The file only appears at save_path once fully written (atomic rename).
+    Returns a BLAKE2b content digest computed on the same pass.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    part_path = save_path + ".part"
+    try:
+        with open(part_path, "wb") as f:
+            while chunk := file.stream.read(UPLOAD_CHUNK_SIZE):
+                hasher.update(chunk)
+                f.write(chunk)
+        os.replace(part_path, save_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(part_path)
+        raise
+    return hasher.hexdigest()
+
+
+def run_model_job(path: str, model_name: str, doc_type_id: str | None) -> Dict[str, Any]:
+    """
+    Run a saved model on a one-shot upload, then delete the upload's temp dir.
+    """
+    try:
+        result = run_pipeline_with_logs(path, override_doc_type_id=doc_type_id)
+    finally:
+        shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+    return {
+        "model": model_name,
+        "doc_type_id": doc_type_id,
+        "result": result,
+    }
+
+
 def require_openai_key() -> None:
     if not os.environ.get("OPENAI_API_KEY"):
         raise RuntimeError(
@@ -77,6 +451,26 @@ def error_response(message: str, status_code: int = 500):
     return jsonify({"error": message}), status_code
 
 
+def is_truthy(value: Any) -> bool:
+    """
+    Parse an on/off request option: JSON true, or "1"/"true"/"yes" (any case).
+    """
+    if isinstance(value, bool):
+        return value
+    return isinstance(value, (str, int)) and str(value).lower() in {"1", "true", "yes"}
+
+
+def conditional_json(payload: Dict[str, Any]) -> Response:
+    """
+    jsonify() with a content-hash ETag; answers If-None-Match with 304.
+    no-cache makes the browser revalidate every time, so saved edits show up at once.
+    """
+    response = jsonify(payload)
+    response.add_etag()
+    response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
+
+
 INDEX_HTML = """
 <!doctype html>
 <html lang="en">
@@ -536,13 +930,27 @@ INDEX_HTML = """
 """
 
 
-@app.route("/")
-def index():
-    return Response(INDEX_HTML, mimetype="text/html")
+# The page is static: encode, compress and hash it once at import.
+INDEX_HTML_BYTES = INDEX_HTML.encode("utf-8")
+INDEX_HTML_GZIP = gzip.compress(INDEX_HTML_BYTES, compresslevel=9, mtime=0)
+INDEX_ETAG = hashlib.blake2b(INDEX_HTML_BYTES, digest_size=16).hexdigest()
 
 
-@app.route("/api/doc-types", methods=["GET"])
-def api_doc_types():
+@app.route("/")
+def index():
+    if request.accept_encodings["gzip"]:
+        response = Response(INDEX_HTML_GZIP, mimetype="text/html")
+        response.headers["Content-Encoding"] = "gzip"
+        response.set_etag(INDEX_ETAG + "-gz")
+    else:
+        response = Response(INDEX_HTML_BYTES, mimetype="text/html")
+        response.set_etag(INDEX_ETAG)
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = "public, max-age=3600"
+    return response.make_conditional(request)
+
+
+def list_doc_types() -> Dict[str, Any]:
     items = [{"id": k, "label": v} for k, v in MORTGAGE_DOC_TYPES.items()]
     custom_doc_types = discover_schema_doc_types()
     for doc_type_id, label in custom_doc_types.items():
@@ -556,13 +964,21 @@ def api_doc_types():
 
     items.append({"id": "unknown", "label": "Unknown / generic template"})
     items = sorted(items, key=lambda x: x["id"])
-    return jsonify({"doc_types": items})
+    return {"doc_types": items}
+
+
+@app.route("/api/doc-types", methods=["GET"])
+def api_doc_types():
+    # Only cache when STORE is shared, so invalidation reaches every worker.
+    if STORE.shared:
+        return conditional_json(cached_payload("resp:doc-types", list_doc_types))
+    return conditional_json(list_doc_types())
 
 
 @app.route("/api/schema/<doc_type_id>", methods=["GET"])
 def api_schema(doc_type_id: str):
-    schema = load_schema_for_doc_type(doc_type_id)
-    return jsonify({"schema": schema})
+    # No response cache: load_schema_for_doc_type is already a stat() + copy.
+    return conditional_json({"schema": load_schema_for_doc_type(doc_type_id)})
 
 
 @app.route("/api/upload", methods=["POST"])
@@ -575,17 +991,34 @@ def api_upload():
 
     try:
         require_openai_key()
+        sweep_uploads()
 
         filename = secure_filename(file.filename)
         doc_id = str(uuid.uuid4())
         save_name = f"{doc_id}_{filename}"
         save_path = os.path.join(UPLOAD_FOLDER, save_name)
-        file.save(save_path)
-
-        DOC_STORE[doc_id] = save_path
+        digest = save_upload(file, save_path)
+
+        previous = STORE.get(f"upload:{digest}")
+        previous_path = STORE.get(f"doc:{previous['doc_id']}") if previous else None
+        if previous_path and _touch(previous_path):
+            # Same bytes already uploaded and classified: reuse that doc_id (and
+            # with it any cached OCR results), restarting its TTL.
+            os.remove(save_path)
+            doc_id = previous["doc_id"]
+            classification = previous["classification"]
+            STORE.set(f"doc:{doc_id}", previous_path, ttl=DOC_TTL_SECONDS)
+            STORE.set(f"upload:{digest}", previous, ttl=DOC_TTL_SECONDS)
+        else:
+            STORE.set(f"doc:{doc_id}", save_path, ttl=DOC_TTL_SECONDS)
+            pages = load_document_as_images(save_path)
+            classification = classify_document(pages)
+            STORE.set(
+                f"upload:{digest}",
+                {"doc_id": doc_id, "classification": classification},
+                ttl=DOC_TTL_SECONDS,
+            )
 
-        pages = load_document_as_images(save_path)
-        classification = classify_document(pages)
         doc_type_id = classification.get("doc_type_id", "unknown")
         schema = load_schema_for_doc_type(doc_type_id)
 
@@ -606,13 +1039,31 @@ def api_run_ocr():
     doc_id = data.get("doc_id")
     doc_type_id = data.get("doc_type_id")
 
-    if not doc_id or doc_id not in DOC_STORE:
+    path = STORE.get(f"doc:{doc_id}") if doc_id else None
+    if not path:
         return "Unknown or missing doc_id", 400
 
     try:
         require_openai_key()
-        path = DOC_STORE[doc_id]
-        result = run_pipeline_with_logs(path, override_doc_type_id=doc_type_id)
+        cache_key = pipeline_result_key(doc_id, "ocr", doc_type_id)
+        force = is_truthy(data.get("force"))
+        if is_truthy(data.get("async")):
+            job_id = submit_job(
+                run_pipeline_with_logs,
+                cache_key=cache_key,
+                force=force,
+                path=path,
+                override_doc_type_id=doc_type_id,
+            )
+            return jsonify({"job_id": job_id, "doc_id": doc_id, "status": "queued"}), 202
+
+        result = run_cached(
+            cache_key,
+            force,
+            run_pipeline_with_logs,
+            path=path,
+            override_doc_type_id=doc_type_id,
+        )
         return jsonify(result)
     except Exception as exc:  # noqa: BLE001
         return error_response(str(exc), 500)
@@ -628,7 +1079,10 @@ def api_run_agentic_ocr():
         "doc_id": "uuid",
         "doc_type_id": "current_acct_statements" (optional),
         "use_evaluator": true (optional, default true),
-        "required_fields": ["field1", "field2"] (optional)
+        "required_fields": ["field1", "field2"] (optional),
+        "async": false (optional; if true, returns 202 + job_id to poll
+                        at GET /api/jobs/<job_id>),
+        "force": false (optional; if true, ignore a cached result)
     }
 
     Returns enhanced result with:
@@ -637,6 +1091,11 @@ def api_run_agentic_ocr():
     - assessment_report: Field status analysis
     - flagged_fields: Fields needing attention
     - quality_metrics: Overall quality scores
+
+    With doc_type_id set, repeating a request with the same doc_id, options
+    and template (including a re-upload of identical bytes) returns the
+    earlier result; send "force": true to re-run. Empty extractions (e.g.
+    after an OpenAI error) are never reused.
     """
     data = request.get_json(force=True)
     doc_id = data.get("doc_id")
@@ -644,26 +1103,53 @@ def api_run_agentic_ocr():
     use_evaluator = data.get("use_evaluator", True)
     required_fields = data.get("required_fields")
 
-    if not doc_id or doc_id not in DOC_STORE:
+    path = STORE.get(f"doc:{doc_id}") if doc_id else None
+    if not path:
         return "Unknown or missing doc_id", 400
 
     try:
         require_openai_key()
-        path = DOC_STORE[doc_id]
-
-        # Run agentic pipeline (handles its own logging)
-        result = run_agentic_pipeline(
-            path=path,
-            override_doc_type_id=doc_type_id,
+        pipeline_kwargs = {
+            "path": path,
+            "override_doc_type_id": doc_type_id,
+            "use_evaluator": use_evaluator,
+            "required_fields": required_fields,
+        }
+        cache_key = pipeline_result_key(
+            doc_id,
+            "agentic",
+            doc_type_id,
             use_evaluator=use_evaluator,
             required_fields=required_fields,
         )
+        force = is_truthy(data.get("force"))
+
+        if is_truthy(data.get("async")):
+            job_id = submit_job(
+                run_agentic_pipeline, cache_key=cache_key, force=force, **pipeline_kwargs
+            )
+            return jsonify({"job_id": job_id, "doc_id": doc_id, "status": "queued"}), 202
+
+        # Run agentic pipeline (handles its own logging); reused for identical re-runs
+        result = run_cached(cache_key, force, run_agentic_pipeline, **pipeline_kwargs)
 
         return jsonify(result)
     except Exception as exc:  # noqa: BLE001
         return error_response(str(exc), 500)
 
 
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+def api_job_status(job_id: str):
+    state = STORE.get(f"job:{job_id}")
+    if state is None:
+        return f"Unknown job '{job_id}'", 404
+    if state["status"] == "running":
+        return jsonify({"job_id": job_id, "status": "running"}), 202
+    if state["status"] == "error":
+        return error_response(state["error"], 500)
+    return jsonify({"job_id": job_id, "status": "done", "result": state["result"]})
+
+
 @app.route("/api/templates", methods=["POST"])
 def api_templates():
     data = request.get_json(force=True)
@@ -673,8 +1159,13 @@ def api_templates():
         return "doc_type_id and schema dict required", 400
 
     dest_path = os.path.join(SCHEMA_DIR, f"{doc_type_id}.json")
-    with open(dest_path, "w", encoding="utf-8") as f:
-        json.dump(schema, f, indent=2)
+    if load_schema_file(dest_path) == schema:
+        # Unchanged template: skip the rewrite.
+        return jsonify({"ok": True, "path": dest_path, "unchanged": True})
+
+    with open(dest_path, "wb") as f:
+        f.write(orjson.dumps(schema, option=orjson.OPT_INDENT_2))
+    STORE.delete("resp:doc-types")
 
     return jsonify({"ok": True, "path": dest_path})
 
@@ -688,17 +1179,20 @@ def api_save_model():
         return "name and doc_type_id required", 400
 
     models = load_models()
-    models[name] = {
+    cfg = {
         "doc_type_id": doc_type_id,
         "description": data.get("description", ""),
     }
-    save_models(models)
+    if models.get(name) != cfg:
+        models[name] = cfg
+        save_models(models)
+        STORE.delete("resp:doc-types")
     return jsonify({"ok": True, "models": models})
 
 
 @app.route("/api/models", methods=["GET"])
 def api_list_models():
-    return jsonify({"models": load_models()})
+    return conditional_json({"models": load_models()})
 
 
 @app.route("/api/<model_name>", methods=["POST"])
@@ -720,20 +1214,23 @@ def api_run_model(model_name: str):
         require_openai_key()
 
         filename = secure_filename(file.filename)
-        tmp_id = str(uuid.uuid4())
-        save_name = f"{tmp_id}_{filename}"
-        save_path = os.path.join(UPLOAD_FOLDER, save_name)
-        file.save(save_path)
-
-        result = run_pipeline_with_logs(save_path, override_doc_type_id=doc_type_id)
-
-        return jsonify(
-            {
-                "model": model_name,
-                "doc_type_id": doc_type_id,
-                "result": result,
-            }
-        )
+        tmp_dir = tempfile.mkdtemp(prefix="model_upload_")
+        job_kwargs = {
+            "path": os.path.join(tmp_dir, f"upload_{filename}"),
+            "model_name": model_name,
+            "doc_type_id": doc_type_id,
+        }
+        try:
+            save_upload(file, job_kwargs["path"])
+            # ?async=1 -> 202 + job_id, poll GET /api/jobs/<job_id>
+            if is_truthy(request.args.get("async")):
+                job_id = submit_job(run_model_job, **job_kwargs)
+                return jsonify({"job_id": job_id, "model": model_name, "status": "queued"}), 202
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        return jsonify(run_model_job(**job_kwargs))
     except Exception as exc:  # noqa: BLE001
         return error_response(str(exc), 500)
 
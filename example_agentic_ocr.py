@@ -9,13 +9,24 @@ This script demonstrates how to use the agentic OCR system to:
 4. Get comprehensive quality metrics
 """
 
-import json
+import logging
 import os
 import sys
 
+import orjson
+
 from mortgage_core import run_agentic_pipeline
 
 
+STATUS_EMOJI = {
+    "filled": "✅",
+    "unfilled": "⚠️",
+    "low_confidence": "⚠️",
+    "invalid": "❌",
+    "needs_review": "🔍",
+}
+
+
 def print_section(title: str):
     """Print a formatted section header"""
     print("\n" + "=" * 70)
@@ -30,23 +41,15 @@ def print_field_status(field_name: str, field_detail: dict, show_value: bool = F
     value = field_detail.get("value", "")
     notes = field_detail.get("notes", "")
 
-    # Status emoji
-    status_emoji = {
-        "filled": "✅",
-        "unfilled": "⚠️",
-        "low_confidence": "⚠️",
-        "invalid": "❌",
-        "needs_review": "🔍",
-    }
-    emoji = status_emoji.get(status, "❓")
-
-    # Print
-    print(f"  {emoji} {field_name:<30} {status:<15} (conf: {confidence:.2f})", end="")
+    emoji = STATUS_EMOJI.get(status, "❓")
+
+    # Build the line once, then print
+    parts = [f"  {emoji} {field_name:<30} {status:<15} (conf: {confidence:.2f})"]
     if show_value and value:
-        print(f" → {str(value)[:30]}", end="")
+        parts.append(f" → {str(value)[:30]}")
     if notes:
-        print(f"\n     Note: {notes}", end="")
-    print()
+        parts.append(f"\n     Note: {notes}")
+    print("".join(parts))
 
 
 def main():
@@ -180,8 +183,8 @@ def main():
     print_section("💾 SAVING RESULTS")
     print(f"  Saving detailed results to: {output_file}")
 
-    with open(output_file, "w") as f:
-        json.dump(result, f, indent=2)
+    with open(output_file, "wb") as f:
+        f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
 
     print(f"  ✅ Saved successfully")
 
@@ -212,4 +215,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # run_agentic_pipeline prints its own progress; this shows the lines
+    # run_full_pipeline logs when it falls back (ocr_agent not importable).
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     main()
@@ -3,11 +3,13 @@
 Simple web UI for document processing with field assessment and flagging
 """
 
+import asyncio
+import logging
 import os
-import json
 from typing import Dict, Any, Tuple
 
 import gradio as gr
+import orjson
 import pandas as pd
 
 # Import agentic OCR system
@@ -30,19 +32,99 @@ def format_quality_score(score: float) -> str:
         return f"❌ {score:.1f}/100 (Poor)"
 
 
+FIELD_STATUS_LABELS = {
+    "filled": "✅ Filled",
+    "unfilled": "⚠️ Unfilled",
+    "low_confidence": "⚠️ Low Confidence",
+    "invalid": "❌ Invalid",
+    "needs_review": "🔍 Needs Review",
+}
+
+GOOD_COLOR = "#10b981"
+BAD_COLOR = "#ef4444"
+
+# Result panels; filled via str.format in process_document
+SUMMARY_HTML = """
+        <div style="padding: 20px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; border-radius: 10px; margin-bottom: 20px;">
+            <h2 style="margin: 0 0 10px 0;">📄 Document Analysis Complete</h2>
+            <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 10px; margin-top: 15px;">
+                <div><strong>Document Type:</strong> {doc_title}</div>
+                <div><strong>Classification Confidence:</strong> {classification_confidence:.0%}</div>
+                <div><strong>Total Pages:</strong> {total_pages}</div>
+                <div><strong>Total Fields:</strong> {total_fields}</div>
+            </div>
+        </div>
+        """
+
+QUALITY_METRICS_HTML = """
+        <div style="padding: 20px; background: #f8f9fa; border-radius: 10px; margin-bottom: 20px;">
+            <h3 style="margin-top: 0;">📊 Quality Metrics</h3>
+            <div style="display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 15px; margin-top: 15px;">
+                <div style="text-align: center; padding: 15px; background: white; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+                    <div style="font-size: 28px; font-weight: bold; color: {quality_color};">
+                        {quality_score:.1f}/100
+                    </div>
+                    <div style="color: #6b7280; margin-top: 5px;">Quality Score</div>
+                </div>
+                <div style="text-align: center; padding: 15px; background: white; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+                    <div style="font-size: 28px; font-weight: bold; color: {completion_color};">
+                        {completion_rate:.1f}%
+                    </div>
+                    <div style="color: #6b7280; margin-top: 5px;">Completion Rate</div>
+                </div>
+                <div style="text-align: center; padding: 15px; background: white; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+                    <div style="font-size: 28px; font-weight: bold; color: {confidence_color};">
+                        {avg_confidence:.2f}
+                    </div>
+                    <div style="color: #6b7280; margin-top: 5px;">Avg Confidence</div>
+                </div>
+            </div>
+            <div style="display: grid; grid-template-columns: 1fr 1fr 1fr 1fr; gap: 10px; margin-top: 15px;">
+                <div style="text-align: center;">
+                    <div style="font-size: 24px; color: #10b981;">✅ {filled_fields}</div>
+                    <div style="font-size: 12px; color: #6b7280;">Filled</div>
+                </div>
+                <div style="text-align: center;">
+                    <div style="font-size: 24px; color: #f59e0b;">⚠️ {unfilled_fields}</div>
+                    <div style="font-size: 12px; color: #6b7280;">Unfilled</div>
+                </div>
+                <div style="text-align: center;">
+                    <div style="font-size: 24px; color: #f59e0b;">⚠️ {low_confidence_fields}</div>
+                    <div style="font-size: 12px; color: #6b7280;">Low Confidence</div>
+                </div>
+                <div style="text-align: center;">
+                    <div style="font-size: 24px; color: #ef4444;">❌ {invalid_fields}</div>
+                    <div style="font-size: 12px; color: #6b7280;">Invalid</div>
+                </div>
+            </div>
+        </div>
+        """
+
+# One flagged-field row; filled via str.format in process_document
+FLAGGED_FIELD_HTML = """
+                <div style="background: white; padding: 10px; border-radius: 6px; display: flex; justify-content: space-between; align-items: center;">
+                    <div>
+                        <strong>{name}</strong>
+                        <span style="margin-left: 10px; color: #6b7280;">{status}</span>
+                        {notes_html}
+                    </div>
+                    <div style="text-align: right;">
+                        <div style="font-weight: bold; color: {confidence_color};">
+                            {confidence:.2f}
+                        </div>
+                        <div style="font-size: 11px; color: #6b7280;">confidence</div>
+                    </div>
+                </div>
+                """
+FLAGGED_NOTES_HTML = '<div style="font-size: 12px; color: #6b7280; margin-top: 4px;">{notes}</div>'
+
+
 def format_field_status(status: str) -> str:
     """Format field status with emoji"""
-    status_map = {
-        "filled": "✅ Filled",
-        "unfilled": "⚠️ Unfilled",
-        "low_confidence": "⚠️ Low Confidence",
-        "invalid": "❌ Invalid",
-        "needs_review": "🔍 Needs Review",
-    }
-    return status_map.get(status, status)
+    return FIELD_STATUS_LABELS.get(status, status)
 
 
-def process_document(
+async def process_document(
     pdf_file,
     doc_type: str,
     use_evaluator: bool,
@@ -100,8 +182,10 @@ def process_document(
 
         progress(0.2, desc="Running agentic OCR...")
 
-        # Run agentic OCR
-        result = run_agentic_pipeline(
+        # Run agentic OCR in a worker thread so the event loop stays free for
+        # progress updates (runs are still one at a time; see process_btn.click)
+        result = await asyncio.to_thread(
+            run_agentic_pipeline,
             path=pdf_file.name,
             override_doc_type_id=override_doc_type,
             use_evaluator=use_evaluator,
@@ -118,99 +202,60 @@ def process_document(
         field_details = assessment.get("field_details", {})
 
         # Build summary HTML
-        summary_html = f"""
-        <div style="padding: 20px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; border-radius: 10px; margin-bottom: 20px;">
-            <h2 style="margin: 0 0 10px 0;">📄 Document Analysis Complete</h2>
-            <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 10px; margin-top: 15px;">
-                <div><strong>Document Type:</strong> {classification.get('doc_title', 'Unknown')}</div>
-                <div><strong>Classification Confidence:</strong> {classification.get('confidence', 0):.0%}</div>
-                <div><strong>Total Pages:</strong> {result.get('total_pages', 0)}</div>
-                <div><strong>Total Fields:</strong> {assessment.get('total_fields', 0)}</div>
-            </div>
-        </div>
-        """
+        summary_html = SUMMARY_HTML.format(
+            doc_title=classification.get("doc_title", "Unknown"),
+            classification_confidence=classification.get("confidence", 0),
+            total_pages=result.get("total_pages", 0),
+            total_fields=assessment.get("total_fields", 0),
+        )
 
         # Build quality metrics HTML
         quality_score = quality_metrics.get("quality_score", 0)
         completion_rate = quality_metrics.get("completion_rate", 0)
         avg_confidence = quality_metrics.get("average_confidence", 0)
 
-        quality_html = f"""
-        <div style="padding: 20px; background: #f8f9fa; border-radius: 10px; margin-bottom: 20px;">
-            <h3 style="margin-top: 0;">📊 Quality Metrics</h3>
-            <div style="display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 15px; margin-top: 15px;">
-                <div style="text-align: center; padding: 15px; background: white; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                    <div style="font-size: 28px; font-weight: bold; color: {'#10b981' if quality_score >= 60 else '#ef4444'};">
-                        {quality_score:.1f}/100
-                    </div>
-                    <div style="color: #6b7280; margin-top: 5px;">Quality Score</div>
-                </div>
-                <div style="text-align: center; padding: 15px; background: white; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                    <div style="font-size: 28px; font-weight: bold; color: {'#10b981' if completion_rate >= 70 else '#ef4444'};">
-                        {completion_rate:.1f}%
-                    </div>
-                    <div style="color: #6b7280; margin-top: 5px;">Completion Rate</div>
-                </div>
-                <div style="text-align: center; padding: 15px; background: white; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                    <div style="font-size: 28px; font-weight: bold; color: {'#10b981' if avg_confidence >= 0.7 else '#ef4444'};">
-                        {avg_confidence:.2f}
-                    </div>
-                    <div style="color: #6b7280; margin-top: 5px;">Avg Confidence</div>
-                </div>
-            </div>
-            <div style="display: grid; grid-template-columns: 1fr 1fr 1fr 1fr; gap: 10px; margin-top: 15px;">
-                <div style="text-align: center;">
-                    <div style="font-size: 24px; color: #10b981;">✅ {assessment.get('filled_fields', 0)}</div>
-                    <div style="font-size: 12px; color: #6b7280;">Filled</div>
-                </div>
-                <div style="text-align: center;">
-                    <div style="font-size: 24px; color: #f59e0b;">⚠️ {assessment.get('unfilled_fields', 0)}</div>
-                    <div style="font-size: 12px; color: #6b7280;">Unfilled</div>
-                </div>
-                <div style="text-align: center;">
-                    <div style="font-size: 24px; color: #f59e0b;">⚠️ {assessment.get('low_confidence_fields', 0)}</div>
-                    <div style="font-size: 12px; color: #6b7280;">Low Confidence</div>
-                </div>
-                <div style="text-align: center;">
-                    <div style="font-size: 24px; color: #ef4444;">❌ {assessment.get('invalid_fields', 0)}</div>
-                    <div style="font-size: 12px; color: #6b7280;">Invalid</div>
-                </div>
-            </div>
-        </div>
-        """
+        quality_html = QUALITY_METRICS_HTML.format(
+            quality_score=quality_score,
+            quality_color=GOOD_COLOR if quality_score >= 60 else BAD_COLOR,
+            completion_rate=completion_rate,
+            completion_color=GOOD_COLOR if completion_rate >= 70 else BAD_COLOR,
+            avg_confidence=avg_confidence,
+            confidence_color=GOOD_COLOR if avg_confidence >= 0.7 else BAD_COLOR,
+            filled_fields=assessment.get("filled_fields", 0),
+            unfilled_fields=assessment.get("unfilled_fields", 0),
+            low_confidence_fields=assessment.get("low_confidence_fields", 0),
+            invalid_fields=assessment.get("invalid_fields", 0),
+        )
 
         # Build flagged fields HTML
         if flagged_fields:
-            flagged_html = f"""
+            flagged_parts = [
+                f"""
             <div style="padding: 20px; background: #fef3c7; border-radius: 10px; border-left: 4px solid #f59e0b;">
                 <h3 style="margin-top: 0; color: #92400e;">⚠️ Flagged Fields ({len(flagged_fields)})</h3>
                 <p style="color: #78350f; margin-bottom: 15px;">These fields need attention:</p>
                 <div style="display: grid; gap: 10px;">
             """
+            ]
             for field_name in flagged_fields[:15]:  # Show first 15
                 field_info = field_details.get(field_name, {})
-                status = field_info.get("status", "unknown")
                 confidence = field_info.get("confidence", 0.0)
                 notes = field_info.get("notes", "")
-
-                flagged_html += f"""
-                <div style="background: white; padding: 10px; border-radius: 6px; display: flex; justify-content: space-between; align-items: center;">
-                    <div>
-                        <strong>{field_name}</strong>
-                        <span style="margin-left: 10px; color: #6b7280;">{format_field_status(status)}</span>
-                        {f'<div style="font-size: 12px; color: #6b7280; margin-top: 4px;">{notes}</div>' if notes else ''}
-                    </div>
-                    <div style="text-align: right;">
-                        <div style="font-weight: bold; color: {'#10b981' if confidence >= 0.7 else '#ef4444'};">
-                            {confidence:.2f}
-                        </div>
-                        <div style="font-size: 11px; color: #6b7280;">confidence</div>
-                    </div>
-                </div>
-                """
+                flagged_parts.append(
+                    FLAGGED_FIELD_HTML.format(
+                        name=field_name,
+                        status=format_field_status(field_info.get("status", "unknown")),
+                        notes_html=FLAGGED_NOTES_HTML.format(notes=notes) if notes else "",
+                        confidence=confidence,
+                        confidence_color=GOOD_COLOR if confidence >= 0.7 else BAD_COLOR,
+                    )
+                )
             if len(flagged_fields) > 15:
-                flagged_html += f'<div style="text-align: center; color: #78350f; padding: 10px;">... and {len(flagged_fields) - 15} more</div>'
-            flagged_html += "</div></div>"
+                flagged_parts.append(
+                    f'<div style="text-align: center; color: #78350f; padding: 10px;">... and {len(flagged_fields) - 15} more</div>'
+                )
+            flagged_parts.append("</div></div>")
+            flagged_html = "".join(flagged_parts)
         else:
             flagged_html = """
             <div style="padding: 20px; background: #d1fae5; border-radius: 10px; border-left: 4px solid #10b981;">
@@ -219,22 +264,25 @@ def process_document(
             </div>
             """
 
-        # Build DataFrame for field details
-        df_data = []
+        # Build DataFrame for field details (column-wise, one pass)
+        names, values, confidences, statuses = [], [], [], []
         for field_name, field_info in field_details.items():
-            df_data.append(
-                {
-                    "Field Name": field_name,
-                    "Value": str(field_info.get("value", ""))[:50],  # Truncate long values
-                    "Confidence": f"{field_info.get('confidence', 0):.2f}",
-                    "Status": format_field_status(field_info.get("status", "unknown")),
-                }
-            )
+            names.append(field_name)
+            values.append(str(field_info.get("value", ""))[:50])  # Truncate long values
+            confidences.append(f"{field_info.get('confidence', 0):.2f}")
+            statuses.append(format_field_status(field_info.get("status", "unknown")))
 
-        df = pd.DataFrame(df_data)
+        df = pd.DataFrame(
+            {
+                "Field Name": names,
+                "Value": values,
+                "Confidence": confidences,
+                "Status": statuses,
+            }
+        )
 
         # Format raw JSON
-        raw_json = json.dumps(
+        raw_json = orjson.dumps(
             {
                 "classification": classification,
                 "extracted_data": result.get("extracted_data", {}),
@@ -242,8 +290,8 @@ def process_document(
                 "assessment_report": assessment,
                 "quality_metrics": quality_metrics,
             },
-            indent=2,
-        )
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+        ).decode("utf-8")
 
         progress(1.0, desc="Complete!")
 
@@ -399,6 +447,10 @@ def create_gradio_interface():
                 fields_table,
                 json_output,
             ],
+            # One run at a time: the API key is set process-wide in os.environ
+            # and mortgage_core shares one OpenAI client, so concurrent sessions
+            # would race on credentials.
+            concurrency_limit=1,
         )
 
     return demo
@@ -412,5 +464,8 @@ def launch_gradio(share=True, debug=False):
 
 
 if __name__ == "__main__":
+    # run_agentic_pipeline prints its own progress; this shows the lines
+    # run_full_pipeline logs when it falls back (ocr_agent not importable).
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     demo = create_gradio_interface()
     demo.launch()
@@ -1,8 +1,13 @@
 import base64
+import copy
+import hashlib
 import json
+import logging
 import os
+import threading
+from collections import OrderedDict
 from io import BytesIO
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from openai import OpenAI
 from pdf2image import convert_from_path
@@ -21,6 +26,10 @@ except ImportError:
 # Allow slightly truncated images without crashing
 ImageFile.LOAD_TRUNCATED_IMAGES = True
 
+# Progress of the JSON-mode pipeline; app.run_pipeline_with_logs captures it per request.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
 # ==========================================
 # 0. API KEY SETUP
 # ==========================================
@@ -320,6 +329,26 @@ SCHEMAS["valuation_report"] = {
 # ==========================================
 # 2. SCHEMA LOADER (supports folder overrides)
 # ==========================================
+# schema path -> ((mtime_ns, size), parsed JSON); re-parsed only when the file changes
+_SCHEMA_FILE_CACHE: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+
+def _read_schema_file(schema_path: str) -> Any:
+    """
+    Parse a schema file, reusing the cached parse while its mtime/size are unchanged.
+    Raises FileNotFoundError if the file does not exist.
+    """
+    st = os.stat(schema_path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _SCHEMA_FILE_CACHE.get(schema_path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    with open(schema_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    _SCHEMA_FILE_CACHE[schema_path] = (stamp, data)
+    return data
+
+
 def load_schema_for_doc_type(doc_type_id: str) -> Dict[str, Any]:
     """
     Load schema for a given doc_type_id.
@@ -329,14 +358,15 @@ def load_schema_for_doc_type(doc_type_id: str) -> Dict[str, Any]:
       3) GENERIC_DOC_TEMPLATE
     """
     schema_path = os.path.join("schemas", f"{doc_type_id}.json")
-    if os.path.exists(schema_path):
-        try:
-            with open(schema_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            data.setdefault("doc_type_id", doc_type_id)
-            return data
-        except Exception as e:  # noqa: BLE001
-            print(f"[schema] Failed to load {schema_path}: {e}")
+    try:
+        # Callers may mutate the result, so never hand out the cached object.
+        data = copy.deepcopy(_read_schema_file(schema_path))
+        data.setdefault("doc_type_id", doc_type_id)
+        return data
+    except FileNotFoundError:
+        pass
+    except Exception as e:  # noqa: BLE001
+        logger.warning("[schema] Failed to load %s: %s", schema_path, e)
 
     if doc_type_id in SCHEMAS:
         base = dict(SCHEMAS[doc_type_id])
@@ -351,19 +381,71 @@ def load_schema_for_doc_type(doc_type_id: str) -> Dict[str, Any]:
 # ==========================================
 # 3. UTILITIES
 # ==========================================
+PDF_RENDER_DPI = 200
+# Rasterized pages are large (~12 MB per A4 page at 200 dpi), so the cache is
+# bounded by total pixel bytes rather than by document count. 0 disables it.
+PAGE_CACHE_MAX_BYTES = int(os.environ.get("PAGE_CACHE_MB", "256")) << 20
+
+# (content sha256, ext, dpi) -> (pixel bytes, pages), least recently used first
+_PAGE_CACHE: "OrderedDict[Tuple[str, str, int], Tuple[int, List[Image.Image]]]" = OrderedDict()
+_PAGE_CACHE_LOCK = threading.Lock()
+_page_cache_bytes = 0
+
+
+def _file_sha256(path: str) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _pages_nbytes(pages: List[Image.Image]) -> int:
+    return sum(img.width * img.height * len(img.getbands()) for img in pages)
+
+
+def _rasterize(path: str, ext: str) -> List[Image.Image]:
+    if ext == ".pdf":
+        return convert_from_path(path, dpi=PDF_RENDER_DPI)
+    img = Image.open(path)
+    img.load()
+    img = img.convert("RGB")
+    return [img]
+
+
 def load_document_as_images(path: str) -> List[Image.Image]:
     """
     If PDF → convert each page to an image.
     If image → return a single-page list.
+    Pages are cached by file content, so re-running the same document
+    (e.g. with another doc type) skips rasterization.
     """
+    global _page_cache_bytes
     ext = os.path.splitext(path)[1].lower()
-    if ext == ".pdf":
-        pages = convert_from_path(path, dpi=200)
+    if PAGE_CACHE_MAX_BYTES <= 0:
+        return _rasterize(path, ext)
+
+    key = (_file_sha256(path), ext, PDF_RENDER_DPI)
+    with _PAGE_CACHE_LOCK:
+        entry = _PAGE_CACHE.get(key)
+        if entry is not None:
+            _PAGE_CACHE.move_to_end(key)
+            return list(entry[1])
+
+    pages = _rasterize(path, ext)
+    nbytes = _pages_nbytes(pages)
+    if nbytes > PAGE_CACHE_MAX_BYTES:
         return pages
-    img = Image.open(path)
-    img.load()
-    img = img.convert("RGB")
-    return [img]
+    with _PAGE_CACHE_LOCK:
+        previous = _PAGE_CACHE.pop(key, None)
+        if previous is not None:
+            _page_cache_bytes -= previous[0]
+        _PAGE_CACHE[key] = (nbytes, pages)
+        _page_cache_bytes += nbytes
+        while _page_cache_bytes > PAGE_CACHE_MAX_BYTES:
+            evicted_bytes, _ = _PAGE_CACHE.popitem(last=False)[1]
+            _page_cache_bytes -= evicted_bytes
+    return list(pages)
 
 
 def image_to_base64_png(img: Image.Image) -> str:
@@ -528,10 +610,10 @@ def extract_with_schema_all_pages(
 
     page_results: List[Dict[str, Any]] = []
 
-    print(f"[agent] Using schema for doc_type_id='{doc_type_id}' with {len(base_template)} fields.")
-    print("[agent] Running OpenAI JSON-mode extraction per page...")
+    logger.info("[agent] Using schema for doc_type_id='%s' with %d fields.", doc_type_id, len(base_template))
+    logger.info("[agent] Running OpenAI JSON-mode extraction per page...")
     for i, page in enumerate(pages, start=1):
-        print(f"   - Page {i} / {len(pages)}")
+        logger.info("   - Page %d / %d", i, len(pages))
 
         system_prompt = "You are a precise JSON-only extractor for mortgage documents."
         user_instructions = f"""
@@ -585,7 +667,7 @@ def evaluate_and_refine(
     first_page = pages[0]
 
     for i in range(1, max_iters + 1):
-        print(f"[agent] Evaluation iteration {i}...")
+        logger.info("[agent] Evaluation iteration %d...", i)
 
         eval_template = {
             "passed": False,
@@ -636,12 +718,12 @@ Return ONLY a JSON object matching JSON_TEMPLATE (including 'fixed_output').
         eval_result["iteration"] = i
 
         last_eval = eval_result
-        print(f"   passed: {eval_result['passed']}, score: {eval_result['score']}")
+        logger.info("   passed: %s, score: %s", eval_result["passed"], eval_result["score"])
         if not eval_result["passed"]:
-            print("   issues:", eval_result.get("issues", []))
+            logger.info("   issues: %s", eval_result.get("issues", []))
             current_extracted = fixed
         else:
-            print("[agent] Evaluation passed, stopping loop.")
+            logger.info("[agent] Evaluation passed, stopping loop.")
             break
 
     return {
@@ -663,12 +745,12 @@ def run_full_pipeline(
     Returns a dict with classification, schema_used, page_extractions, extracted_initial,
     extracted_final, evaluation.
     """
-    print(f"[agent] Loading document: {path}")
+    logger.info("[agent] Loading document: %s", path)
     pages = load_document_as_images(path)
-    print(f"[agent] Loaded {len(pages)} page(s).")
+    logger.info("[agent] Loaded %d page(s).", len(pages))
 
     if override_doc_type_id:
-        print(f"[agent] Using user-selected doc_type_id='{override_doc_type_id}' (skipping classifier).")
+        logger.info("[agent] Using user-selected doc_type_id='%s' (skipping classifier).", override_doc_type_id)
         doc_type_id = override_doc_type_id
         classification = {
             "doc_type_id": doc_type_id,
@@ -677,9 +759,9 @@ def run_full_pipeline(
             "rationale": "User-selected template, classifier bypassed.",
         }
     else:
-        print("[agent] Classifying document type...")
+        logger.info("[agent] Classifying document type...")
         classification = classify_document(pages)
-        print("   Classification:", json.dumps(classification, indent=2))
+        logger.info("   Classification: %s", json.dumps(classification, indent=2))
         doc_type_id = classification.get("doc_type_id", "unknown")
 
     schema = load_schema_for_doc_type(doc_type_id)